@@ -0,0 +1 @@
+from .tweet_mapper import tweet_from_data
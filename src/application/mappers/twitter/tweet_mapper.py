@@ -0,0 +1,30 @@
+"""
+Mapping tweet data returned by the twitter api client to tweet
+entities.
+"""
+
+from datetime import datetime
+from typing import Any
+from src.domain.entities.twitter import Tweet
+
+
+def tweet_from_data(
+    tweet_data: dict[str, Any],
+) -> Tweet:
+    """
+    Maps tweet data returned by the twitter api client (single tweet
+    and tweets lookups, liked tweets pages) to a tweet entity.
+    """
+    # API v2 timestamps are ISO 8601 of the format:
+    # "2019-06-19T02:39:57.000Z"
+    created_at_dt: datetime = datetime.strptime(
+        tweet_data["created_at"],
+        "%Y-%m-%dT%H:%M:%S.%f%z",
+    )
+    return Tweet(
+        tweet_id=tweet_data["id"],
+        author_id=tweet_data["author_id"],
+        content=tweet_data["content"],
+        created_at=created_at_dt,
+        like_count=tweet_data.get("like_count", 0),
+    )
@@ -0,0 +1,135 @@
+"""
+Implementation of the flow of a user removing stale likes in bulk.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import src.infrastructure.api_clients.twitter as twitter
+from src.application.mappers.twitter import tweet_from_data
+from src.domain.entities.twitter import Tweet
+from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.profiling import profile_stage
+from src.infrastructure.storage import CheckpointStore
+
+
+class CleanUpLikes:
+
+    def __init__(
+        self,
+        twitter_api_client: twitter.ApiClient,
+        tweet_liking_service: TweetLikingService,
+        cleanup_criteria: Callable[[Tweet], bool],
+        checkpoint_store: CheckpointStore,
+        max_concurrency: int = 4,
+        max_unlikes: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            cleanup_criteria (Callable): Decides which liked tweets
+                get unliked, e.g. lambda tweet: not tweet.is_recent(
+                30 * 24 * 60) for likes on tweets older than 30 days.
+            checkpoint_store (CheckpointStore): Where the page reached
+                so far is kept between sessions.
+            max_concurrency (int): Max number of unlike requests in
+                flight at once.
+            max_unlikes (int): Stop the session after this many
+                unlikes, None for no limit.
+        """
+        self.twitter_api_client = twitter_api_client
+        self.tweet_liking_service = tweet_liking_service
+        self.cleanup_criteria = cleanup_criteria
+        self.checkpoint_store = checkpoint_store
+        self.max_concurrency: int = max_concurrency
+        self.max_unlikes: Optional[int] = max_unlikes
+
+    def _unlike(
+        self,
+        tweet: Tweet,
+    ) -> bool:
+        # The tweets were already filtered by the cleanup criteria,
+        # evaluating them again could disagree (e.g. for time based
+        # criteria) after the tweet took a slot of the budget.
+        return self.tweet_liking_service.unlike_tweet(
+            tweet,
+            lambda tweet: True,
+        )
+
+    def execute(self) -> int:
+        """
+        Execution of the flow of actions in a process of cleaning up
+        likes, resuming from the last checkpoint.
+        Returns the number of tweets unliked in this session.
+        """
+        checkpoint: dict = self.checkpoint_store.load()
+        pagination_token: Optional[str] = checkpoint.get("pagination_token")
+        total_unliked: int = checkpoint.get("unliked", 0)
+        session_unliked: int = 0
+        # Number of unlike requests this session may still send.
+        unlikes_left: Optional[int] = self.max_unlikes
+
+        if pagination_token:
+            print(f"Resuming likes cleanup from page {pagination_token}.")
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # The token of the page being processed, which is where
+            # the next session resumes if this page is cut short.
+            page_token: Optional[str] = pagination_token
+            for tweets_data, next_token in self.twitter_api_client.get_liked_tweets(
+                pagination_token,
+            ):
+                with profile_stage("map_to_entity"):
+                    tweets: list[Tweet] = [
+                        tweet_from_data(tweet_data) for tweet_data in tweets_data
+                    ]
+                with profile_stage("criteria"):
+                    tweets = [
+                        tweet for tweet in tweets if self.cleanup_criteria(tweet)
+                    ]
+
+                page_cut_short: bool = (
+                    unlikes_left is not None and len(tweets) > unlikes_left
+                )
+                if unlikes_left is not None:
+                    # Not sending more unlikes than the session allows.
+                    tweets = tweets[:unlikes_left]
+                    unlikes_left -= len(tweets)
+
+                # Waiting for the whole page before moving the
+                # checkpoint forward, so an interrupted page is
+                # scanned again next session.
+                results: list[bool] = list(executor.map(self._unlike, tweets))
+                page_unliked: int = sum(results)
+                session_unliked += page_unliked
+                total_unliked += page_unliked
+
+                if page_cut_short:
+                    # The rest of the page is left for the next
+                    # session, which scans this page again.
+                    self.checkpoint_store.save(
+                        {
+                            "pagination_token": page_token,
+                            "unliked": total_unliked,
+                        }
+                    )
+                    print(f"Reached the limit of {self.max_unlikes} unlikes.")
+                    break
+
+                if next_token is None:
+                    # We went through all the likes, the next cleanup
+                    # starts over from the first page.
+                    self.checkpoint_store.clear()
+                    break
+
+                self.checkpoint_store.save(
+                    {
+                        "pagination_token": next_token,
+                        "unliked": total_unliked,
+                    }
+                )
+                page_token = next_token
+                if unlikes_left == 0:
+                    print(f"Reached the limit of {self.max_unlikes} unlikes.")
+                    break
+
+        print(f"Unliked {session_unliked} tweets ({total_unliked} in total).")
+        return session_unliked
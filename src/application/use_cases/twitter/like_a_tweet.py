@@ -2,11 +2,12 @@
 Implementation of the flow of a user liking a tweet.
 """
 
-from datetime import datetime
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 import src.infrastructure.api_clients.twitter as twitter
+from src.application.mappers.twitter import tweet_from_data
 from src.domain.entities.twitter import Tweet, Id
 from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.profiling import profile_stage
 
 
 class LikeATweet:
@@ -30,22 +31,13 @@ class LikeATweet:
         """
         Fetches a tweet by its ID using the twitter api client.
         """
-        tweet_data: Optional[dict[str, str]] = self.twitter_api_client.get_tweet_by_id(
-            tweet_id
-        )
-        if tweet_data:
-            # Currently, tweets' creation timestamps are of the
-            # format: "Wed Jun 19 02:39:57 +0000 2019"
-            created_at_dt: datetime = datetime.strptime(
-                tweet_data["created_at"],
-                "%a %b %d %H:%M:%S %z %Y",
-            )
-            return Tweet(
-                tweet_id=tweet_data["id"],
-                author_id=tweet_data["author_id"],
-                content=tweet_data["content"],
-                created_at=created_at_dt,
+        with profile_stage("fetch"):
+            tweet_data: Optional[dict[str, Any]] = (
+                self.twitter_api_client.get_tweet_by_id(tweet_id)
             )
+        if tweet_data:
+            with profile_stage("map_to_entity"):
+                return tweet_from_data(tweet_data)
         return None
 
     def execute(self) -> bool:
@@ -0,0 +1,72 @@
+"""
+Implementation of the flow of a user liking the tweets listed in an
+ID file, in batches.
+"""
+
+from typing import Any, Callable, Optional
+import src.infrastructure.api_clients.twitter as twitter
+from src.application.mappers.twitter import tweet_from_data
+from src.domain.entities.twitter import Tweet
+from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.profiling import profile_stage
+from src.infrastructure.storage import TweetIdFileReader
+
+
+class LikeTweetsFromFile:
+
+    def __init__(
+        self,
+        twitter_api_client: twitter.ApiClient,
+        tweet_liking_service: TweetLikingService,
+        engagement_criteria: Callable[[Tweet], bool],
+        tweet_id_reader: TweetIdFileReader,
+    ) -> None:
+        """
+        Args:
+            tweet_id_reader (TweetIdFileReader): The input stage,
+                handing out the IDs in lookup sized batches and
+                checkpointing the ones already processed.
+        """
+        self.twitter_api_client = twitter_api_client
+        self.tweet_liking_service = tweet_liking_service
+        self.engagement_criteria = engagement_criteria
+        self.tweet_id_reader = tweet_id_reader
+
+    def execute(self) -> int:
+        """
+        Execution of the flow of actions in a process of liking the
+        tweets of the ID file, resuming from the last checkpoint.
+        Returns the number of tweets liked in this run.
+        """
+        liked: int = 0
+        for tweet_ids in self.tweet_id_reader.read_batches():
+            with profile_stage("fetch"):
+                tweets_data: Optional[list[dict[str, Any]]] = (
+                    self.twitter_api_client.get_tweets_by_ids(tweet_ids)
+                )
+            if tweets_data is None:
+                # Stopping before asking for the next batch, so the
+                # failed one is not checkpointed and is retried on
+                # the next run.
+                print("Fetching tweets failed, stopping.")
+                break
+
+            if len(tweets_data) < len(tweet_ids):
+                print(
+                    f"{len(tweet_ids) - len(tweets_data)} tweets of the batch",
+                    "were not found.",
+                )
+
+            with profile_stage("map_to_entity"):
+                tweets: list[Tweet] = [
+                    tweet_from_data(tweet_data) for tweet_data in tweets_data
+                ]
+            for tweet in tweets:
+                if self.tweet_liking_service.like_tweet(
+                    tweet,
+                    self.engagement_criteria,
+                ):
+                    liked += 1
+
+        print(f"Liked {liked} tweets.")
+        return liked
@@ -0,0 +1,163 @@
+"""
+Implementation of the flow of syncing tweets' like counts with the
+ones reported by Twitter.
+"""
+
+import threading
+from typing import Callable, Optional
+import src.infrastructure.api_clients.twitter as twitter
+from src.domain.entities.twitter import Tweet
+from src.infrastructure.profiling import profile_stage
+
+
+class ReconcileLikeCounts:
+    """
+    Collects tweets whose local like counts may have drifted and
+    refreshes them in bulk, 100 tweets per lookup, either on demand or
+    on a schedule.
+
+    Tweets fetched through the api client already carry their like
+    count, so this is meant for flows that keep tweet entities around
+    or persist counts (`persist_like_counts`) after liking them.
+    """
+
+    def __init__(
+        self,
+        twitter_api_client: twitter.ApiClient,
+        persist_like_counts: Optional[Callable[[dict[str, int]], None]] = None,
+        batch_size: int = 100,
+    ) -> None:
+        """
+        Args:
+            persist_like_counts (Callable): Called with the refreshed
+                {tweet_id: like_count} of every batch, for writing them
+                to a persisted store.
+            batch_size (int): Number of tweets per lookup (max 100).
+        """
+        self.twitter_api_client = twitter_api_client
+        self.persist_like_counts = persist_like_counts
+        self.batch_size: int = batch_size
+
+        # Tweets waiting for a refresh, {tweet_id: [tweet entities]}
+        # since the same tweet may be held by several entities.
+        self._stale_tweets: dict[str, list[Tweet]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        self._stop_event: threading.Event = threading.Event()
+        self._scheduler: Optional[threading.Thread] = None
+
+    def mark_stale(
+        self,
+        tweet: Tweet,
+    ) -> None:
+        """
+        Queues the tweet for the next refresh.
+        """
+        with self._lock:
+            tweets: list[Tweet] = self._stale_tweets.setdefault(
+                str(tweet.tweet_id),
+                [],
+            )
+            if not any(queued is tweet for queued in tweets):
+                tweets.append(tweet)
+
+    def execute(self) -> int:
+        """
+        Refreshes the like counts of all the queued tweets.
+        Returns the number of tweets that were refreshed.
+        """
+        # Taking the queue as a whole so tweets marked stale in the
+        # meantime wait for the next run.
+        with self._lock:
+            stale_tweets: dict[str, list[Tweet]] = self._stale_tweets
+            self._stale_tweets = {}
+
+        refreshed: int = 0
+        tweet_ids: list[str] = list(stale_tweets)
+        # Number of queued tweets processed so far (refreshed, or put
+        # back after a failed lookup).
+        processed: int = 0
+        try:
+            for start in range(0, len(tweet_ids), self.batch_size):
+                batch: list[str] = tweet_ids[start : start + self.batch_size]
+                with profile_stage("fetch"):
+                    public_metrics: Optional[dict[str, dict[str, int]]] = (
+                        self.twitter_api_client.get_tweets_public_metrics(batch)
+                    )
+                if public_metrics is None:
+                    # The lookup failed, we'll try these again next run.
+                    for tweet_id in batch:
+                        for tweet in stale_tweets[tweet_id]:
+                            self.mark_stale(tweet)
+                    processed += len(batch)
+                    continue
+
+                like_counts: dict[str, int] = {
+                    tweet_id: metrics["like_count"]
+                    for tweet_id, metrics in public_metrics.items()
+                    if tweet_id in stale_tweets
+                }
+                # Tweets missing from the lookup were deleted or made
+                # private, there's nothing to sync them with.
+                for tweet_id, like_count in like_counts.items():
+                    for tweet in stale_tweets[tweet_id]:
+                        tweet.sync_like_count(like_count)
+
+                if self.persist_like_counts and like_counts:
+                    self.persist_like_counts(like_counts)
+                refreshed += len(like_counts)
+                processed += len(batch)
+        finally:
+            # On any error (e.g. a connection error or a failing
+            # store), the batches not processed yet go back to the
+            # queue rather than being dropped.
+            for tweet_id in tweet_ids[processed:]:
+                for tweet in stale_tweets[tweet_id]:
+                    self.mark_stale(tweet)
+
+        return refreshed
+
+    def _run_on_schedule(
+        self,
+        interval_in_sec: float,
+    ) -> None:
+        while not self._stop_event.wait(interval_in_sec):
+            # A failed run must not end the scheduled refreshes, the
+            # tweets it didn't get to stay queued for the next one.
+            try:
+                self.execute()
+            except Exception as e:
+                print(f"[ERROR] Reconciling like counts failed: {e}")
+
+    def start(
+        self,
+        interval_in_sec: float = 15 * 60,
+    ) -> None:
+        """
+        Refreshes the queued tweets every `interval_in_sec` seconds in
+        a background thread.
+        """
+        if self._scheduler and self._scheduler.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._scheduler = threading.Thread(
+            target=self._run_on_schedule,
+            args=(interval_in_sec,),
+            daemon=True,
+        )
+        self._scheduler.start()
+
+    def stop(self) -> None:
+        """
+        Stops the scheduled refreshes and refreshes whatever is still
+        queued (tweets that fail to refresh stay queued).
+        """
+        self._stop_event.set()
+        if self._scheduler:
+            self._scheduler.join()
+            self._scheduler = None
+        try:
+            self.execute()
+        except Exception as e:
+            print(f"[ERROR] Reconciling like counts failed: {e}")
@@ -36,6 +36,16 @@ class Tweet:
         """
         self.like_count -= 1
 
+    def sync_like_count(
+        self,
+        like_count: int,
+    ) -> None:
+        """
+        Replaces the locally tracked count with the one reported by
+        Twitter.
+        """
+        self.like_count = like_count
+
     def is_recent(
         self,
         threshold_in_min: int = 60,
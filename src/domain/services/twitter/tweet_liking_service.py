@@ -1,7 +1,8 @@
-from typing import Callable
+from typing import Callable, Optional
 from types import MethodType
 from src.domain.entities.twitter import Tweet
 import src.infrastructure.api_clients.twitter as twitter
+from src.infrastructure.profiling import profile_stage
 
 
 class TweetLikingService:
@@ -12,8 +13,24 @@ class TweetLikingService:
     def __init__(
         self,
         twitter_api_client: twitter.ApiClient,
+        on_like_count_change: Optional[Callable[[Tweet], None]] = None,
+        on_engagement: Optional[
+            Callable[[Tweet, bool, str, Optional[float]], None]
+        ] = None,
     ):
+        """
+        Args:
+            on_like_count_change (Callable): Called with every tweet
+                whose local like count changed, e.g. for queuing it
+                for reconciliation with Twitter.
+            on_engagement (Callable): Called with the outcome of every
+                engagement: the tweet, whether it met the criteria,
+                the status and the API request latency in seconds
+                (None if no request was sent), e.g. for recording it.
+        """
         self.twitter_api_client = twitter_api_client
+        self.on_like_count_change = on_like_count_change
+        self.on_engagement = on_engagement
 
     def like_tweet(
         self,
@@ -30,20 +47,70 @@ class TweetLikingService:
             engagement_criteria,
             tweet,
         )
-        if not bound_engagement_criteria():
+        with profile_stage("criteria"):
+            meets_criteria: bool = bound_engagement_criteria()
+        if not meets_criteria:
             print(
                 f"Tweet {tweet.tweet_id} skipped since it does not meet the engagement criteria."
             )
+            if self.on_engagement:
+                self.on_engagement(tweet, False, "skipped", None)
             return False
 
         # Since the tweet meets the criteria, we call the api client
         # to like it.
-        success: bool = self.twitter_api_client.like_tweet(tweet)
+        with profile_stage("like"):
+            success: bool = self.twitter_api_client.like_tweet(tweet)
+        if self.on_engagement:
+            self.on_engagement(
+                tweet,
+                True,
+                "liked" if success else "failed",
+                self.twitter_api_client.get_last_request_latency(),
+            )
         if success:
             # If the request was successful, we update the inner
             # tweet entity.
             tweet.like()
+            if self.on_like_count_change:
+                self.on_like_count_change(tweet)
         else:
             print(f"Request to like tweet {tweet.tweet_id} failed.")
 
         return success
+
+    def unlike_tweet(
+        self,
+        tweet: Tweet,
+        cleanup_criteria: Callable[[Tweet], bool],
+    ) -> bool:
+        """
+        If the tweet meets the cleanup criteria, it unlikes the tweet
+        and returns True, otherwise returns False.
+        """
+        bound_cleanup_criteria: Callable[[], bool] = MethodType(
+            cleanup_criteria,
+            tweet,
+        )
+        with profile_stage("criteria"):
+            meets_criteria: bool = bound_cleanup_criteria()
+        if not meets_criteria:
+            return False
+
+        with profile_stage("unlike"):
+            success: bool = self.twitter_api_client.unlike_tweet(tweet)
+        if self.on_engagement:
+            self.on_engagement(
+                tweet,
+                True,
+                "unliked" if success else "unlike_failed",
+                self.twitter_api_client.get_last_request_latency(),
+            )
+        if success:
+            tweet.unlike()
+            if self.on_like_count_change:
+                self.on_like_count_change(tweet)
+        else:
+            print(f"Request to unlike tweet {tweet.tweet_id} failed.")
+
+        return success
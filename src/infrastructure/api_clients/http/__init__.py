@@ -0,0 +1 @@
+from .record_replay import RecordingAdapter, ReplayAdapter
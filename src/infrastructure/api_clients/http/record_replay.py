@@ -0,0 +1,213 @@
+"""
+Transports (requests adapters) recording http traffic to cassette
+files and replaying it without a network.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+
+# Headers holding an epoch timestamp, shifted on replay by the time
+# passed since the recording.
+RATE_LIMIT_RESET_HEADERS: tuple[str, ...] = ("x-rate-limit-reset",)
+
+
+def _request_key(
+    method: str,
+    url: str,
+) -> str:
+    """
+    Identifies a request by its method and url, ignoring the order of
+    the query parameters.
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+    sorted_query: str = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit((scheme, netloc, path, sorted_query, ''))}"
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Sends requests through another adapter and records every
+    request/response pair, rate limit headers included, to a
+    cassette file.
+
+    Request headers are never recorded since they carry the
+    credentials.
+    """
+
+    def __init__(
+        self,
+        cassette_path: str,
+        adapter: Optional[BaseAdapter] = None,
+    ) -> None:
+        """
+        Args:
+            cassette_path (str): The JSON file the traffic is saved to.
+            adapter (BaseAdapter): The adapter actually sending the
+                requests, a regular HTTPAdapter by default.
+        """
+        super().__init__()
+        self.cassette_path: str = cassette_path
+        self.adapter: BaseAdapter = adapter or HTTPAdapter()
+        self.interactions: list[dict[str, Any]] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def send(
+        self,
+        request: PreparedRequest,
+        **kwargs: Any,
+    ) -> Response:
+        # Session.send only sets response.elapsed once the adapter
+        # returns, so we time the request ourselves.
+        request_start: float = time.perf_counter()
+        response: Response = self.adapter.send(request, **kwargs)
+        elapsed: float = time.perf_counter() - request_start
+        request_body: Any = request.body
+        if isinstance(request_body, bytes):
+            request_body = request_body.decode("utf-8", errors="replace")
+
+        interaction: dict[str, Any] = {
+            "recorded_at": time.time(),
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "body": request_body,
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": dict(response.headers),
+                # Bodies are stored base64 encoded so binary and
+                # compressed payloads survive the trip through JSON.
+                "body": base64.b64encode(response.content).decode("ascii"),
+                "elapsed": elapsed,
+            },
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def save(self) -> None:
+        """
+        Writes the recorded interactions to the cassette file.
+        """
+        directory: str = os.path.dirname(self.cassette_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            with open(self.cassette_path, "w", encoding="utf-8") as cassette:
+                json.dump({"interactions": self.interactions}, cassette, indent=2)
+
+    def close(self) -> None:
+        self.save()
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers requests with the responses recorded in a cassette file,
+    without touching the network.
+
+    Requests are matched by method and url, and repeated requests get
+    the recorded responses in the order they were recorded.
+
+    Rate limit reset times are shifted by the time passed since each
+    response was recorded, so a replayed quota is as far from its
+    reset as the recorded one was, whenever the cassette is replayed.
+    """
+
+    def __init__(
+        self,
+        cassette_path: str,
+        original_timing: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            cassette_path (str): The JSON file written by a
+                RecordingAdapter.
+            original_timing (bool): Whether to wait as long as the
+                original response took, or answer right away.
+            clock (Callable): The current epoch time the reset times
+                are shifted to, the same clock the client reads.
+        """
+        super().__init__()
+        self.cassette_path: str = cassette_path
+        self.original_timing: bool = original_timing
+        self.clock: Callable[[], float] = clock
+
+        with open(cassette_path, "r", encoding="utf-8") as cassette:
+            interactions: list[dict[str, Any]] = json.load(cassette)["interactions"]
+
+        # {request key: recorded responses in order}
+        self._responses: dict[str, deque[dict[str, Any]]] = {}
+        for interaction in interactions:
+            key: str = _request_key(
+                interaction["request"]["method"],
+                interaction["request"]["url"],
+            )
+            self._responses.setdefault(key, deque()).append(
+                {**interaction["response"], "recorded_at": interaction.get("recorded_at")}
+            )
+        self._lock: threading.Lock = threading.Lock()
+
+    def send(
+        self,
+        request: PreparedRequest,
+        **kwargs: Any,
+    ) -> Response:
+        key: str = _request_key(request.method or "", request.url or "")
+        with self._lock:
+            recorded_responses: Optional[deque[dict[str, Any]]] = self._responses.get(
+                key
+            )
+            if not recorded_responses:
+                raise ConnectionError(
+                    f"No recorded response left for {key} in {self.cassette_path}.",
+                    request=request,
+                )
+            recorded: dict[str, Any] = recorded_responses.popleft()
+
+        if self.original_timing:
+            time.sleep(recorded["elapsed"])
+
+        response: Response = Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        # Cassettes recorded without a timestamp keep their headers.
+        if recorded["recorded_at"] is not None:
+            time_since_recording: float = self.clock() - recorded["recorded_at"]
+            for header in RATE_LIMIT_RESET_HEADERS:
+                if header in response.headers:
+                    response.headers[header] = str(
+                        int(response.headers[header]) + round(time_since_recording)
+                    )
+        # The recorded body is already decoded, so the encoding
+        # headers no longer apply.
+        response.headers.pop("content-encoding", None)
+        response._content = base64.b64decode(recorded["body"])
+        response.url = request.url or ""
+        response.request = request
+        response.encoding = "utf-8"
+        response.connection = self
+        return response
+
+    def remaining(self) -> int:
+        """
+        Returns the number of recorded responses not replayed yet.
+        """
+        with self._lock:
+            return sum(len(responses) for responses in self._responses.values())
+
+    def close(self) -> None:
+        pass
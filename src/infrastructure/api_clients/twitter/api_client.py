@@ -1,13 +1,19 @@
+import threading
 import time
+from contextlib import contextmanager
 from tweepy import (  # type: ignore
     OAuth1UserHandler,
     Client,
+    Paginator,
     Tweet,
     errors,
     Response,
 )
 from src.domain.entities.twitter import Tweet, Id
-from typing import Optional
+from src.infrastructure.profiling import profile_stage
+import requests
+from requests.adapters import BaseAdapter
+from typing import Any, Callable, Iterator, Optional
 
 
 class ApiClient:
@@ -21,6 +27,8 @@ class ApiClient:
         consumer_secret: str,
         access_token: str,
         access_token_secret: str,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
     ):
         self.consumer_key = consumer_key
         self.consumer_secret = consumer_secret
@@ -35,11 +43,97 @@ class ApiClient:
             access_token=self.access_token,
             access_token_secret=self.access_token_secret,
         )
-        self.client: Client = Client(self.auth)
+        # The tweepy client signs user context requests with the
+        # credentials themselves, so it gets them directly rather
+        # than through the auth handler.
+        self.client: Client = Client(
+            consumer_key=self.consumer_key,
+            consumer_secret=self.consumer_secret,
+            access_token=self.access_token,
+            access_token_secret=self.access_token_secret,
+        )
 
         # Storing request quotas per endpoint.
         # {endpoint: (remaining_requests, reset_time)}
         self.request_quotas: dict[str, tuple[int, int]] = {}
+        # Number of requests per endpoint sent but not answered yet,
+        # which the remaining quota is already promised to.
+        self._requests_in_flight: dict[str, int] = {}
+        self._quota_lock: threading.Lock = threading.Lock()
+
+        # tweepy's parsed responses carry no headers, so we read the
+        # rate limit headers off every http response instead. The
+        # endpoint a response belongs to is the one the current
+        # thread is sending a request to.
+        self._current_request: threading.local = threading.local()
+        self.client.session.hooks["response"].append(self._on_http_response)
+
+        # The id of the authenticated user, fetched once on first use.
+        self._user_id: Optional[Id] = None
+
+        # Reading the time and waiting (for quota resets and
+        # backoffs) go through these, so a replayed session can run
+        # on a simulated clock instead of in real time.
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], None] = sleep
+
+    def use_http_adapter(
+        self,
+        adapter: BaseAdapter,
+    ) -> None:
+        """
+        Routes the client's https traffic through the given transport,
+        e.g. for recording it or replaying a recording.
+        """
+        self.client.session.mount("https://", adapter)
+
+    def _tweet_to_data(
+        self,
+        tweet: Tweet,
+    ) -> dict[str, Any]:
+        """
+        Extracts the data we use out of a tweepy tweet.
+        """
+        return {
+            "id": tweet.data["id"],
+            "author_id": tweet.data.get("author_id", ""),
+            "content": tweet.data["text"],
+            "created_at": tweet.data.get("created_at", ""),
+            "like_count": (tweet.public_metrics or {}).get("like_count", 0),
+        }
+
+    def _get_user_id(self) -> Id:
+        """
+        Returns the id of the authenticated user, only asking the API
+        for it the first time.
+        """
+        if self._user_id is None:
+            self._user_id = self.client.get_me().data.id
+        return self._user_id
+
+    def _on_http_response(
+        self,
+        response: requests.Response,
+        *args,
+        **kwargs,
+    ) -> None:
+        """
+        Session hook updating the quota of the endpoint the current
+        thread sent a request to, and keeping the request's latency.
+        """
+        self._current_request.latency = response.elapsed.total_seconds()
+        endpoint: Optional[str] = getattr(self._current_request, "endpoint", None)
+        if endpoint:
+            self._update_request_quota(endpoint, response)
+
+    def get_last_request_latency(self) -> Optional[float]:
+        """
+        Returns how long (in seconds) the last http request of the
+        current thread took, without any waiting for quotas or
+        backoffs. None if the last action sent no request or got no
+        response.
+        """
+        return getattr(self._current_request, "latency", None)
 
     def _update_request_quota(
         self,
@@ -49,13 +143,17 @@ class ApiClient:
         """
         Updating stored rate limits after an API request.
         """
-        if response and "x-rate-limit-remaining" in response.headers:
+        # Only raw http responses carry headers, tweepy's parsed ones
+        # don't.
+        headers = getattr(response, "headers", None)
+        if headers and "x-rate-limit-remaining" in headers:
             remaining = int(
-                response.headers["x-rate-limit-remaining"],
+                headers["x-rate-limit-remaining"],
             )
-            reset_time = int(response.headers["x-rate-limit-reset"])
+            reset_time = int(headers["x-rate-limit-reset"])
             # We're storing the uri of the endpoint as the key in our # rate limit dict.
-            self.request_quotas[endpoint] = (remaining, reset_time)
+            with self._quota_lock:
+                self.request_quotas[endpoint] = (remaining, reset_time)
 
     def _is_above_request_quota(
         self,
@@ -72,10 +170,51 @@ class ApiClient:
         remaining_requests: int
         if endpoint in self.request_quotas:
             remaining_requests, reset_time = self.request_quotas[endpoint]
-            exceeded_quota = remaining_requests == 0
+            # Requests in flight will use up part of what's remaining.
+            # Once the reset time passed the quota is full again.
+            exceeded_quota = (
+                remaining_requests - self._requests_in_flight.get(endpoint, 0) <= 0
+                and reset_time > self._clock()
+            )
 
         return exceeded_quota, reset_time
 
+    @contextmanager
+    def _request_quota(
+        self,
+        endpoint: str,
+    ) -> Iterator[None]:
+        """
+        Reserves one request of the endpoint's quota for the request
+        sent within the block, waiting for the quota to reset if
+        everything remaining is already reserved. This keeps
+        concurrent callers from running into the rate limit.
+        """
+        while True:
+            with self._quota_lock:
+                exceeded_quota, reset_time = self._is_above_request_quota(
+                    endpoint,
+                )
+                if not exceeded_quota:
+                    self._requests_in_flight[endpoint] = (
+                        self._requests_in_flight.get(endpoint, 0) + 1
+                    )
+                    break
+            self._wait_for_request_quota_reset(reset_time)
+
+        previous_endpoint: Optional[str] = getattr(
+            self._current_request,
+            "endpoint",
+            None,
+        )
+        self._current_request.endpoint = endpoint
+        try:
+            yield
+        finally:
+            self._current_request.endpoint = previous_endpoint
+            with self._quota_lock:
+                self._requests_in_flight[endpoint] -= 1
+
     def _wait_for_request_quota_reset(
         self,
         reset_time: int,
@@ -84,12 +223,13 @@ class ApiClient:
         Waits for the rate limit to reset.
         """
         # Using max to avoid negative wait times.
-        wait_time: float = max(0, reset_time - time.time())
+        wait_time: float = max(0, reset_time - self._clock())
         print(
             "[INFO] Rate limit exceeded.",
             f" Waiting for {wait_time:.2f} seconds.",
         )
-        time.sleep(wait_time)
+        with profile_stage("wait"):
+            self._sleep(wait_time)
 
     def like_tweet(
         self,
@@ -110,23 +250,15 @@ class ApiClient:
         """
         attempts_left: int = retries + 1
         current_attempt: int = 1
-        exceeded_quota: bool
-        reset_time: int
-        endpoint: str = (
-            f"https://api.twitter.com/2/users/{self.client.get_me().data.id}/likes"
-        )
+        self._current_request.latency = None
+        endpoint: str = f"https://api.twitter.com/2/users/{self._get_user_id()}/likes"
 
         while attempts_left > 0:
             attempts_left -= 1
-            exceeded_quota, reset_time = self._is_above_request_quota(
-                endpoint,
-            )
-            if exceeded_quota:
-                self._wait_for_request_quota_reset(reset_time)
-
             try:
                 # Sending a request to like the tweet.
-                response: Response = self.client.like(tweet.tweet_id)
+                with self._request_quota(endpoint):
+                    response: Response = self.client.like(tweet.tweet_id)
                 self._update_request_quota(endpoint, response)
                 return True
             except errors.TooManyRequests as e:
@@ -146,7 +278,8 @@ class ApiClient:
                     # If we were above rate limit, waited, tried to
                     # like and it failed, we#ll implement exponential
                     # backoff.
-                    time.sleep(2 ** (current_attempt))
+                    with profile_stage("wait"):
+                        self._sleep(2 ** (current_attempt))
                     current_attempt += 1
 
         return False
@@ -170,23 +303,15 @@ class ApiClient:
         """
         attempts_left: int = retries + 1
         current_attempt: int = 1
-        exceeded_quota: bool
-        reset_time: int
-        endpoint: str = (
-            f"https://api.twitter.com/2/users/{self.client.get_me().data.id}/likes"
-        )
+        self._current_request.latency = None
+        endpoint: str = f"https://api.twitter.com/2/users/{self._get_user_id()}/likes"
 
         while attempts_left > 0:
             attempts_left -= 1
-            exceeded_quota, reset_time = self._is_above_request_quota(
-                endpoint,
-            )
-            if exceeded_quota:
-                self._wait_for_request_quota_reset(reset_time)
-
             try:
                 # Sending a request to unlike the tweet.
-                response: Response = self.client.unlike(tweet.tweet_id)
+                with self._request_quota(endpoint):
+                    response: Response = self.client.unlike(tweet.tweet_id)
                 self._update_request_quota(endpoint, response)
                 return True
             except errors.TooManyRequests as e:
@@ -214,7 +339,8 @@ class ApiClient:
                     # If we were above rate limit, waited, tried to
                     # unlike and it failed, we'll implement
                     # exponential backoff.
-                    time.sleep(2 ** (current_attempt))
+                    with profile_stage("wait"):
+                        self._sleep(2 ** (current_attempt))
                     current_attempt += 1
 
         return False
@@ -222,7 +348,7 @@ class ApiClient:
     def get_tweet_by_id(
         self,
         tweet_id: Id,
-    ) -> Optional[dict[str, str]]:
+    ) -> Optional[dict[str, Any]]:
         """
         Fetches tweet data by ID.
 
@@ -230,27 +356,153 @@ class ApiClient:
             - The tweet data as a dictionary.
             - None if the tweet could not be fetched.
         """
-        tweet_data: Optional[dict[str, str]] = None
-        exceeded_quota: bool
-        reset_time: int  # Timestamp of when the rate limit will
-        # reset.
+        tweet_data: Optional[dict[str, Any]] = None
         endpoint: str = f"https://api.twitter.com/2/tweets"
-        exceeded_quota, reset_time = self._is_above_request_quota(
-            endpoint,
-        )
-        if exceeded_quota:
-            self._wait_for_request_quota_reset(reset_time)
 
         try:
             print(f"[INFO] Fetching tweet {tweet_id}")
-            response: Response = self.client.get_tweet(
-                id=tweet_id,
-            )
+            with self._request_quota(endpoint):
+                response: Response = self.client.get_tweet(
+                    id=tweet_id,
+                    tweet_fields=["author_id", "created_at", "public_metrics"],
+                )
             self._update_request_quota(endpoint, response)
-            # TODO: verify that response["data"] is a dict.
-            tweet_data = response["data"]
+            if response.data:
+                tweet_data = self._tweet_to_data(response.data)
 
         except errors.TweepyException as e:
             print(f"[ERROR] Failed to fetch tweet {tweet_id}: {e}")
 
         return tweet_data
+
+    def get_tweets_by_ids(
+        self,
+        tweet_ids: list[Id],
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Fetches the data of up to 100 tweets in a single request.
+
+        Returns:
+            - The data of the tweets found, tweets that could not be
+              found (e.g. deleted) are left out.
+            - None if the request failed.
+        """
+        if len(tweet_ids) > 100:
+            raise ValueError("A tweets lookup accepts at most 100 ids.")
+
+        tweets_data: Optional[list[dict[str, Any]]] = None
+        endpoint: str = f"https://api.twitter.com/2/tweets"
+
+        try:
+            print(f"[INFO] Fetching {len(tweet_ids)} tweets")
+            with self._request_quota(endpoint):
+                response: Response = self.client.get_tweets(
+                    ids=tweet_ids,
+                    tweet_fields=["author_id", "created_at", "public_metrics"],
+                )
+            self._update_request_quota(endpoint, response)
+            tweets_data = [self._tweet_to_data(tweet) for tweet in response.data or []]
+
+        except errors.TweepyException as e:
+            print(f"[ERROR] Failed to fetch tweets: {e}")
+
+        return tweets_data
+
+    def get_tweets_public_metrics(
+        self,
+        tweet_ids: list[Id],
+    ) -> Optional[dict[str, dict[str, int]]]:
+        """
+        Fetches the public metrics (like_count, retweet_count, etc.)
+        of up to 100 tweets in a single request.
+
+        Returns:
+            - A dictionary of {tweet_id: public_metrics}, tweets that
+              could not be found (e.g. deleted) are left out.
+            - None if the request failed.
+        """
+        if len(tweet_ids) > 100:
+            raise ValueError("A tweets lookup accepts at most 100 ids.")
+
+        public_metrics: Optional[dict[str, dict[str, int]]] = None
+        endpoint: str = f"https://api.twitter.com/2/tweets"
+
+        try:
+            print(f"[INFO] Fetching public metrics of {len(tweet_ids)} tweets")
+            with self._request_quota(endpoint):
+                response: Response = self.client.get_tweets(
+                    ids=tweet_ids,
+                    tweet_fields=["public_metrics"],
+                )
+            self._update_request_quota(endpoint, response)
+            public_metrics = {
+                str(tweet.id): tweet.public_metrics for tweet in response.data or []
+            }
+
+        except errors.TweepyException as e:
+            print(f"[ERROR] Failed to fetch public metrics: {e}")
+
+        return public_metrics
+
+    def get_liked_tweets(
+        self,
+        pagination_token: Optional[str] = None,
+        max_results: int = 100,
+    ) -> Iterator[tuple[list[dict[str, Any]], Optional[str]]]:
+        """
+        Pages through the tweets liked by the authenticated user,
+        waiting for the request quota to reset whenever it runs out.
+
+        Args:
+            pagination_token (str): The page to start from, None for
+                the first page.
+            max_results (int): Number of tweets per page (max 100).
+
+        Yields:
+            - A tuple of the tweets' data on the page and the token of
+              the next page (None on the last page).
+        """
+        user_id: Id = self._get_user_id()
+        endpoint: str = f"https://api.twitter.com/2/users/{user_id}/liked_tweets"
+
+        def get_liked_tweets_page(*args, **kwargs) -> Response:
+            # Every page the paginator asks for is a request of its
+            # own against the quota.
+            with self._request_quota(endpoint):
+                return self.client.get_liked_tweets(*args, **kwargs)
+
+        while True:
+            paginator: Paginator = Paginator(
+                get_liked_tweets_page,
+                user_id,
+                user_auth=True,
+                max_results=max_results,
+                tweet_fields=["author_id", "created_at", "public_metrics"],
+                pagination_token=pagination_token,
+            )
+            try:
+                for response in paginator:
+                    pagination_token = response.meta.get("next_token")
+                    tweets_data: list[dict[str, Any]] = [
+                        self._tweet_to_data(tweet) for tweet in response.data or []
+                    ]
+                    yield tweets_data, pagination_token
+                return
+            except errors.TooManyRequests as e:
+                print(
+                    f"[ERROR] Request quota exceeded: {e}",
+                    "Resuming after reset duration passes.",
+                )
+                # The paginator stopped, so we store the reset time
+                # and restart it from the last page we got.
+                self._update_request_quota(endpoint, e.response)
+                exceeded_quota, reset_time = self._is_above_request_quota(
+                    endpoint,
+                )
+                if not exceeded_quota:
+                    # The error had no rate limit headers, we wait
+                    # for a full quota window.
+                    self._wait_for_request_quota_reset(int(self._clock()) + 15 * 60)
+            except errors.TweepyException as e:
+                print(f"[ERROR] Failed to fetch liked tweets: {e}")
+                return
@@ -0,0 +1 @@
+from .profiler import Profiler, get_profiler, set_profiler, profile_stage
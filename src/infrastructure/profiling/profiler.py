@@ -0,0 +1,220 @@
+"""
+Timing the stages of a run (fetch, map to entity, criteria, like,
+wait) and optionally sampling its stacks for flamegraphs.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional
+
+
+class _StageTimer:
+    """
+    Times a single pass through a stage.
+    """
+
+    __slots__ = ("profiler", "stage", "start")
+
+    def __init__(
+        self,
+        profiler: "Profiler",
+        stage: str,
+    ) -> None:
+        self.profiler = profiler
+        self.stage = stage
+        self.start: int = 0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profiler._add(self.stage, time.perf_counter_ns() - self.start)
+
+
+class Profiler:
+    """
+    Collects per stage timings and, if a sample interval is given,
+    samples the stacks of all threads while running.
+    """
+
+    def __init__(
+        self,
+        sample_interval_in_sec: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            sample_interval_in_sec (float): Time between stack
+                samples, None to only time the stages.
+        """
+        self.sample_interval_in_sec: Optional[float] = sample_interval_in_sec
+
+        # {stage: [calls, total_ns, max_ns]}
+        self.stage_timings: dict[str, list[int]] = {}
+        # {collapsed stack: number of samples}
+        self.stack_samples: Counter = Counter()
+        self._lock: threading.Lock = threading.Lock()
+
+        self._start_ns: int = 0
+        self._stop_ns: int = 0
+        self._stop_event: threading.Event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def stage(
+        self,
+        stage: str,
+    ) -> _StageTimer:
+        """
+        Returns a context manager timing the code it wraps as `stage`.
+        """
+        return _StageTimer(self, stage)
+
+    def _add(
+        self,
+        stage: str,
+        duration_ns: int,
+    ) -> None:
+        with self._lock:
+            timing: Optional[list[int]] = self.stage_timings.get(stage)
+            if timing is None:
+                self.stage_timings[stage] = [1, duration_ns, duration_ns]
+            else:
+                timing[0] += 1
+                timing[1] += duration_ns
+                timing[2] = max(timing[2], duration_ns)
+
+    def _sample_stacks(
+        self,
+        interval_in_sec: float,
+    ) -> None:
+        """
+        Runs in the sampler thread, recording the stack of every other
+        thread in the collapsed format flamegraph tools read
+        ("outer;inner;innermost count").
+        """
+        sampler_id: int = threading.get_ident()
+        while not self._stop_event.wait(interval_in_sec):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                frames: list[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                        f":{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                self.stack_samples[";".join(reversed(frames))] += 1
+
+    def start(self) -> None:
+        """
+        Starts the wall clock and the stack sampler (if enabled).
+        """
+        self._start_ns = time.perf_counter_ns()
+        self._stop_ns = 0
+        if self.sample_interval_in_sec:
+            self._stop_event.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_stacks,
+                args=(self.sample_interval_in_sec,),
+                daemon=True,
+            )
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """
+        Stops the wall clock and the stack sampler.
+        """
+        self._stop_ns = time.perf_counter_ns()
+        if self._sampler:
+            self._stop_event.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def report(self) -> str:
+        """
+        Returns the per stage breakdown as a table. Stages nest (e.g.
+        "wait" happens inside "like"), so shares can add up to more
+        than 100%.
+        """
+        wall_ns: int = (self._stop_ns or time.perf_counter_ns()) - self._start_ns
+        lines: list[str] = [
+            f"{'stage':<16}{'calls':>8}{'total_s':>12}{'mean_ms':>12}"
+            f"{'max_ms':>12}{'share':>8}"
+        ]
+        with self._lock:
+            timings: list[tuple[str, list[int]]] = sorted(
+                self.stage_timings.items(),
+                key=lambda item: item[1][1],
+                reverse=True,
+            )
+        for stage, (calls, total_ns, max_ns) in timings:
+            share: float = 100 * total_ns / wall_ns if wall_ns > 0 else 0.0
+            lines.append(
+                f"{stage:<16}{calls:>8}{total_ns / 1e9:>12.3f}"
+                f"{total_ns / calls / 1e6:>12.3f}{max_ns / 1e6:>12.3f}"
+                f"{share:>7.1f}%"
+            )
+        lines.append(f"{'wall':<16}{'':>8}{wall_ns / 1e9:>12.3f}")
+        return "\n".join(lines)
+
+    def write(
+        self,
+        output_dir: str,
+    ) -> list[str]:
+        """
+        Writes the stage breakdown to "stages.txt" and, if stacks were
+        sampled, the collapsed stacks to "stacks.collapsed" (the input
+        of flamegraph.pl, speedscope, etc.).
+        Returns the paths written.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        stages_path: str = os.path.join(output_dir, "stages.txt")
+        with open(stages_path, "w", encoding="utf-8") as stages_file:
+            stages_file.write(self.report() + "\n")
+        paths: list[str] = [stages_path]
+
+        if self.stack_samples:
+            stacks_path: str = os.path.join(output_dir, "stacks.collapsed")
+            with open(stacks_path, "w", encoding="utf-8") as stacks_file:
+                for stack, samples in self.stack_samples.most_common():
+                    stacks_file.write(f"{stack} {samples}\n")
+            paths.append(stacks_path)
+
+        return paths
+
+
+# The profiler stages are reported to, None when profiling is off.
+_active_profiler: Optional[Profiler] = None
+_NO_PROFILING: ContextManager[None] = nullcontext()
+
+
+def set_profiler(
+    profiler: Optional[Profiler],
+) -> None:
+    """
+    Makes `profiler` the one all stages report to, None turns
+    profiling off.
+    """
+    global _active_profiler
+    _active_profiler = profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _active_profiler
+
+
+def profile_stage(
+    stage: str,
+) -> ContextManager[None]:
+    """
+    Returns a context manager timing the code it wraps as `stage` if
+    profiling is on, and a shared no-op one otherwise.
+    """
+    if _active_profiler is None:
+        return _NO_PROFILING
+    return _active_profiler.stage(stage)
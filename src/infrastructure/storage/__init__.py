@@ -0,0 +1,3 @@
+from .checkpoint_store import CheckpointStore
+from .engagement_log import EngagementLog, EngagementLogReader
+from .tweet_id_file_reader import TweetIdFileReader
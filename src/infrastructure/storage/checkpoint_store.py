@@ -0,0 +1,58 @@
+"""
+Persisting small pieces of progress state between runs.
+"""
+
+import json
+import os
+from typing import Any
+
+
+class CheckpointStore:
+    """
+    A JSON file holding the progress of a long running flow so it can
+    be resumed after a crash or across sessions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+    ) -> None:
+        self.path: str = path
+
+    def load(self) -> dict[str, Any]:
+        """
+        Loads the stored checkpoint.
+
+        Returns:
+            - The checkpoint as a dictionary.
+            - An empty dictionary if nothing was stored yet.
+        """
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path, "r", encoding="utf-8") as checkpoint_file:
+            checkpoint: dict[str, Any] = json.load(checkpoint_file)
+        return checkpoint
+
+    def save(
+        self,
+        checkpoint: dict[str, Any],
+    ) -> None:
+        """
+        Stores the checkpoint, replacing the previous one.
+        """
+        # Writing to a temporary file first and swapping it in, so a
+        # crash mid-write never leaves a corrupted checkpoint behind.
+        tmp_path: str = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """
+        Removes the stored checkpoint so the next run starts over.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
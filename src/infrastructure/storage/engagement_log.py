@@ -0,0 +1,367 @@
+"""
+Recording engagements (likes, skips, failures) to columnar files for
+later analysis.
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+from src.domain.entities.twitter import Tweet
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pyarrow is only needed when logging engagements.
+    pa = None
+    pq = None
+
+
+FILE_FORMATS: dict[str, str] = {"parquet": ".parquet", "arrow": ".arrow"}
+# Suffix of files still being written, which readers skip.
+IN_PROGRESS_SUFFIX: str = ".inprogress"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "The engagement log requires pyarrow, install it with"
+            " `pip install pyarrow`."
+        )
+
+
+def _engagement_schema() -> Any:
+    return pa.schema(
+        [
+            ("tweet_id", pa.string()),
+            ("author_id", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("criteria_result", pa.bool_()),
+            ("latency_ms", pa.float64()),
+            ("status", pa.string()),
+            ("account", pa.string()),
+            ("logged_at", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+class EngagementLog:
+    """
+    An append-only log of engagements. Records are handed to a
+    background thread which writes them in row groups, so logging an
+    engagement costs no more than putting it on a queue.
+
+    Every log session writes its own files in `directory`. A file is
+    written under an ".inprogress" name and only gets its final name
+    once it's complete, which happens every `row_groups_per_file` row
+    groups and when the log is closed. A crash therefore only loses
+    the records of the file in progress.
+    """
+
+    # Marks the end of the records for the writer thread.
+    _CLOSE: object = object()
+
+    def __init__(
+        self,
+        directory: str,
+        account: str,
+        file_format: str = "parquet",
+        row_group_size: int = 10_000,
+        flush_interval_in_sec: float = 5.0,
+        row_groups_per_file: int = 10,
+        max_queued_records: int = 100_000,
+    ) -> None:
+        """
+        Args:
+            directory (str): Where the log files are written.
+            account (str): The account engagements are made from.
+            file_format (str): "parquet" or "arrow" (Arrow IPC).
+            row_group_size (int): Number of records written at once.
+            flush_interval_in_sec (float): Max time a record waits
+                before its row group is written, even if it's smaller
+                than `row_group_size`.
+            row_groups_per_file (int): Number of row groups after
+                which a file is completed and a new one started.
+            max_queued_records (int): Max number of records waiting
+                for the writer. Recording blocks while the queue is
+                full, so a slow writer can't grow memory without
+                bounds.
+        """
+        _require_pyarrow()
+        if file_format not in FILE_FORMATS:
+            raise ValueError(
+                f"Unknown file format {file_format}, expected one of"
+                f" {', '.join(FILE_FORMATS)}."
+            )
+
+        self.directory: str = directory
+        self.account: str = account
+        self.file_format: str = file_format
+        self.row_group_size: int = row_group_size
+        self.flush_interval_in_sec: float = flush_interval_in_sec
+        self.row_groups_per_file: int = row_groups_per_file
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.session: str = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        # The completed files of this session.
+        self.paths: list[str] = []
+
+        self._schema = _engagement_schema()
+        self._records: queue.Queue = queue.Queue(maxsize=max_queued_records)
+        # The error the writer thread died of, if it did.
+        self._writer_error: Optional[Exception] = None
+        self._writer_thread: threading.Thread = threading.Thread(
+            target=self._run_writer,
+            daemon=True,
+        )
+        self._writer_thread.start()
+
+    def record(
+        self,
+        tweet: Tweet,
+        criteria_result: bool,
+        status: str,
+        latency_in_sec: Optional[float] = None,
+    ) -> None:
+        """
+        Queues an engagement for writing.
+
+        Args:
+            tweet (Tweet): The tweet engaged with.
+            criteria_result (bool): Whether the tweet met the
+                engagement criteria.
+            status (str): The outcome, e.g. "liked", "skipped" or
+                "failed".
+            latency_in_sec (float): How long the API request took,
+                excluding any waiting for quotas or backoffs. None if
+                no request was sent.
+
+        Once the writer failed, records are dropped (the error is
+        raised by `close()`) rather than failing the engagement.
+        """
+        self._put(
+            (
+                str(tweet.tweet_id),
+                str(tweet.author_id),
+                tweet.created_at,
+                criteria_result,
+                None if latency_in_sec is None else latency_in_sec * 1000,
+                status,
+                self.account,
+                datetime.now(timezone.utc),
+            )
+        )
+
+    def _put(
+        self,
+        item: Any,
+    ) -> bool:
+        """
+        Queues an item for the writer, waiting while the queue is
+        full. Returns False if the writer is dead and the item was
+        dropped.
+        """
+        while self._writer_error is None:
+            try:
+                self._records.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                # Checking the writer is still alive before waiting
+                # again, a dead one would never make room.
+                if not self._writer_thread.is_alive():
+                    break
+        return False
+
+    def _to_record_batch(
+        self,
+        records: list[tuple],
+    ) -> Any:
+        columns: list[list] = [list(column) for column in zip(*records)]
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(column, type=field.type)
+                for column, field in zip(columns, self._schema)
+            ],
+            schema=self._schema,
+        )
+
+    def _run_writer(self) -> None:
+        """
+        Runs in the writer thread, keeping the error it fails with
+        for the recording side.
+        """
+        try:
+            self._write_records()
+        except Exception as e:
+            self._writer_error = e
+            print(f"[ERROR] Writing the engagement log failed, records are dropped: {e}")
+
+    def _write_records(self) -> None:
+        """
+        Runs in the writer thread, collecting records into row groups
+        and appending them to the log file.
+        """
+        writer: Any = None
+        path: str = ""
+        row_groups: int = 0
+        records: list[tuple] = []
+        # When the oldest record waiting to be written must be written.
+        flush_deadline: float = 0.0
+        closing: bool = False
+        while not closing:
+            try:
+                timeout: Optional[float] = (
+                    max(0.0, flush_deadline - time.monotonic()) if records else None
+                )
+                record: Any = self._records.get(timeout=timeout)
+                if record is self._CLOSE:
+                    closing = True
+                else:
+                    if not records:
+                        flush_deadline = (
+                            time.monotonic() + self.flush_interval_in_sec
+                        )
+                    records.append(record)
+                    if (
+                        len(records) < self.row_group_size
+                        and time.monotonic() < flush_deadline
+                    ):
+                        continue
+            except queue.Empty:
+                pass
+
+            if not records:
+                continue
+
+            if writer is None:
+                # A file is only created once there's something to
+                # write to it.
+                path = os.path.join(
+                    self.directory,
+                    f"engagements-{self.session}-{len(self.paths):05d}"
+                    f"{FILE_FORMATS[self.file_format]}",
+                )
+                if self.file_format == "parquet":
+                    writer = pq.ParquetWriter(
+                        path + IN_PROGRESS_SUFFIX,
+                        self._schema,
+                    )
+                else:
+                    writer = pa.ipc.new_file(path + IN_PROGRESS_SUFFIX, self._schema)
+                row_groups = 0
+            record_batch: Any = self._to_record_batch(records)
+            if self.file_format == "parquet":
+                writer.write_batch(record_batch, row_group_size=len(records))
+            else:
+                writer.write_batch(record_batch)
+            records = []
+            row_groups += 1
+
+            if row_groups == self.row_groups_per_file:
+                self._complete_file(writer, path)
+                writer = None
+
+        if writer is not None:
+            self._complete_file(writer, path)
+
+    def _complete_file(
+        self,
+        writer: Any,
+        path: str,
+    ) -> None:
+        """
+        Writes the file's footer and gives it its final name, making
+        it visible to readers.
+        """
+        writer.close()
+        os.replace(path + IN_PROGRESS_SUFFIX, path)
+        self.paths.append(path)
+
+    def close(self) -> None:
+        """
+        Writes the remaining records and closes the log file.
+
+        Raises:
+            RuntimeError: If the writer failed and records were lost.
+        """
+        if self._put(self._CLOSE):
+            self._writer_thread.join()
+        if self._writer_error is not None:
+            raise RuntimeError(
+                f"The engagement log in {self.directory} failed, records"
+                " were lost."
+            ) from self._writer_error
+
+
+class EngagementLogReader:
+    """
+    Reads the files of an engagement log directory through memory
+    maps, so scans only touch the pages of the columns they need.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+    ) -> None:
+        _require_pyarrow()
+        self.directory: str = directory
+
+    def _log_files(self) -> list[str]:
+        # Files still being written (".inprogress") have no footer
+        # yet and are left out by their extension.
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, file_name)
+            for file_name in os.listdir(self.directory)
+            if file_name.startswith("engagements-")
+            and os.path.splitext(file_name)[1] in FILE_FORMATS.values()
+        )
+
+    def iter_tables(
+        self,
+        columns: Optional[list[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        Yields the log one file (pyarrow.Table) at a time.
+        """
+        for path in self._log_files():
+            try:
+                if path.endswith(FILE_FORMATS["parquet"]):
+                    table: Any = pq.read_table(
+                        path,
+                        columns=columns,
+                        memory_map=True,
+                    )
+                else:
+                    # The table's buffers point into the memory map,
+                    # which stays open for as long as they're
+                    # referenced.
+                    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+                    if columns:
+                        table = table.select(columns)
+            except (pa.ArrowException, OSError) as e:
+                # One damaged file shouldn't break scanning the rest.
+                print(f"[WARNING] Skipping unreadable engagement log {path}: {e}")
+                continue
+            yield table
+
+    def read(
+        self,
+        columns: Optional[list[str]] = None,
+    ) -> Any:
+        """
+        Reads the whole log into a single pyarrow.Table.
+
+        Args:
+            columns (list[str]): The columns to read, None for all.
+        """
+        tables: list[Any] = list(self.iter_tables(columns))
+        if not tables:
+            schema: Any = _engagement_schema()
+            if columns:
+                schema = pa.schema([schema.field(column) for column in columns])
+            return schema.empty_table()
+        return pa.concat_tables(tables)
@@ -0,0 +1,187 @@
+"""
+Streaming tweet IDs out of (possibly huge) input files.
+"""
+
+import mmap
+import os
+from collections import deque
+from typing import Any, Iterator, Optional
+from src.domain.entities.twitter import Id
+from .checkpoint_store import CheckpointStore
+
+
+class TweetIdFileReader:
+    """
+    Reads a file holding one tweet ID per line in batches, without
+    loading it into memory, and remembers how far it got so a
+    restarted run picks up where the previous one stopped.
+
+    The checkpoint belongs to the file it was taken on (by inode, size
+    and modification time), a replaced or modified file is read from
+    the start. The dedupe window is not part of the checkpoint, so it
+    starts empty after a restart and duplicates spanning the restart
+    are handed out again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        dedupe_window: int = 100_000,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_every: int = 1,
+    ) -> None:
+        """
+        Args:
+            path (str): The ID file, one tweet ID per line.
+            batch_size (int): Max number of IDs per batch (100 is the
+                max number of IDs a single tweets lookup accepts).
+            dedupe_window (int): How many of the most recent IDs are
+                remembered for skipping duplicates.
+            checkpoint_store (CheckpointStore): Where the processed
+                byte offset is kept. Defaults to "<path>.offset".
+            checkpoint_every (int): Number of batches between
+                checkpoints.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1.")
+
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.dedupe_window: int = dedupe_window
+        self.checkpoint_store: CheckpointStore = (
+            checkpoint_store or CheckpointStore(f"{path}.offset")
+        )
+        self.checkpoint_every: int = checkpoint_every
+
+        # The byte offset up to which every ID was handed out and
+        # processed, loaded from the checkpoint when reading starts.
+        self.offset: int = 0
+        self._file_identity: dict[str, Any] = {}
+
+        # Sliding window of recently seen IDs. The deque keeps the
+        # order for eviction and the set gives O(1) lookups.
+        self._recent_ids: deque[str] = deque()
+        self._recent_ids_set: set[str] = set()
+
+    def _is_duplicate(
+        self,
+        tweet_id: str,
+    ) -> bool:
+        """
+        Checks if the ID was seen within the dedupe window, and
+        remembers it if it was not.
+        """
+        if tweet_id in self._recent_ids_set:
+            return True
+
+        if self.dedupe_window > 0:
+            self._recent_ids.append(tweet_id)
+            self._recent_ids_set.add(tweet_id)
+            if len(self._recent_ids) > self.dedupe_window:
+                self._recent_ids_set.discard(self._recent_ids.popleft())
+        return False
+
+    def _load_offset(self) -> int:
+        """
+        Returns the checkpointed offset if it was taken on the current
+        file, 0 otherwise.
+        """
+        checkpoint: dict[str, Any] = self.checkpoint_store.load()
+        if not checkpoint:
+            return 0
+        if checkpoint.get("file") != self._file_identity:
+            print(
+                f"[WARNING] {self.path} changed since the last checkpoint,",
+                "reading it from the start.",
+            )
+            return 0
+        return int(checkpoint.get("offset", 0))
+
+    def _checkpoint(
+        self,
+        offset: int,
+    ) -> None:
+        """
+        Stores the offset everything before which was processed.
+        """
+        self.offset = offset
+        self.checkpoint_store.save(
+            {
+                "offset": offset,
+                "file": self._file_identity,
+            }
+        )
+
+    def read_batches(self) -> Iterator[list[Id]]:
+        """
+        Yields batches of tweet IDs starting from the last checkpoint.
+
+        A batch counts as processed once the next one is requested
+        (or the file is exhausted), so a consumer that crashes midway
+        gets the unprocessed batch again on the next run.
+        """
+        file_stat: os.stat_result = os.stat(self.path)
+        file_size: int = file_stat.st_size
+        self._file_identity = {
+            "inode": file_stat.st_ino,
+            "size": file_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+        }
+        self.offset = self._load_offset()
+
+        # mmap refuses empty files, and there is nothing to read
+        # anyway when we're already past the end.
+        if file_size == 0 or self.offset >= file_size:
+            return
+
+        with open(self.path, "rb") as id_file, mmap.mmap(
+            id_file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        ) as mapped_file:
+            # Letting the kernel know we go through the pages once,
+            # front to back (not available on every platform).
+            if hasattr(mapped_file, "madvise"):
+                mapped_file.madvise(mmap.MADV_SEQUENTIAL)
+
+            mapped_file.seek(self.offset)
+            batch: list[Id] = []
+            batches_since_checkpoint: int = 0
+            while True:
+                line_offset: int = mapped_file.tell()
+                line: bytes = mapped_file.readline()
+                if not line:
+                    break
+
+                raw_tweet_id: bytes = line.strip()
+                if not raw_tweet_id:
+                    continue
+                # Tweet IDs are plain digits, a bad line is skipped
+                # rather than failing the whole run.
+                if not raw_tweet_id.isdigit():
+                    print(
+                        f"[WARNING] Skipping malformed line at byte {line_offset}",
+                        f"of {self.path}: {raw_tweet_id[:40]!r}",
+                    )
+                    continue
+
+                tweet_id: str = raw_tweet_id.decode("ascii")
+                if not self._is_duplicate(tweet_id):
+                    batch.append(tweet_id)
+
+                if len(batch) == self.batch_size:
+                    yield batch
+                    # The consumer came back for more, so the batch
+                    # we've just handed out is done.
+                    batch = []
+                    batches_since_checkpoint += 1
+                    if batches_since_checkpoint == self.checkpoint_every:
+                        self._checkpoint(mapped_file.tell())
+                        batches_since_checkpoint = 0
+
+            if batch:
+                yield batch
+            self._checkpoint(file_size)
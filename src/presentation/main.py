@@ -1,9 +1,16 @@
 import os, sys
+import argparse
 import datetime
+from typing import Optional
 from dotenv import load_dotenv
 from src.application.use_cases.twitter.like_a_tweet import LikeATweet
+from src.application.use_cases.twitter.like_tweets_from_file import (
+    LikeTweetsFromFile,
+)
 from src.infrastructure.api_clients.twitter.api_client import ApiClient
 from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.storage import EngagementLog, TweetIdFileReader
+from src.infrastructure.profiling import Profiler, set_profiler
 from tweepy import Client, Response  # type: ignore
 
 
@@ -62,10 +69,39 @@ def fetch_tweet() -> None:
     print(f"Tweet: {tweet}")
 
 
-def main() -> None:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Like a tweet.")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each stage of the run and write a breakdown.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="profile",
+        help="Directory the profiling results are written to.",
+    )
+    parser.add_argument(
+        "--profile-sample-interval",
+        type=float,
+        default=None,
+        help=(
+            "Seconds between stack samples for flamegraphs,"
+            " stack sampling is off if not given."
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """
     Entry point of the application.
     """
+    args: argparse.Namespace = parse_args(argv)
+
     consumer_key: str = os.getenv(
         "TWITTER_CONSUMER_KEY",
         default="",
@@ -87,13 +123,19 @@ def main() -> None:
         "TWITTER_TWEET_ID",
         default="",
     )
+    # A file of tweet IDs (one per line) to like in batches, instead
+    # of the single TWITTER_TWEET_ID.
+    tweet_id_file: str = os.getenv(
+        "TWITTER_TWEET_ID_FILE",
+        default="",
+    )
 
     if (
         not consumer_key
         or not consumer_secret
         or not access_token
         or not access_token_secret
-        or not tweet_id
+        or not (tweet_id or tweet_id_file)
     ):
         raise Exception("Missing environment variables.")
 
@@ -104,22 +146,67 @@ def main() -> None:
         access_token_secret,
     )
 
-    tweet_liking_service: TweetLikingService = TweetLikingService(
-        api_client,
+    # Recording engagements is optional, enabled by pointing
+    # TWITTER_ENGAGEMENT_LOG_DIR to a directory.
+    engagement_log_dir: str = os.getenv(
+        "TWITTER_ENGAGEMENT_LOG_DIR",
+        default="",
     )
+    engagement_log: Optional[EngagementLog] = None
+    if engagement_log_dir:
+        engagement_log = EngagementLog(
+            engagement_log_dir,
+            # OAuth 1.0 access tokens are prefixed by the id of the
+            # user they belong to.
+            account=access_token.split("-")[0],
+        )
 
-    use_case: LikeATweet = LikeATweet(
-        twitter_api_client=api_client,
-        tweet_liking_service=tweet_liking_service,
-        # For future use in case we want to filter out tweets.
-        engagement_criteria=lambda tweet: True,
-        tweet_id=tweet_id,
+    tweet_liking_service: TweetLikingService = TweetLikingService(
+        api_client,
+        on_engagement=engagement_log.record if engagement_log else None,
     )
 
-    if use_case.execute():
-        print(f"Tweet was liked successfully!")
+    use_case: Optional[LikeATweet] = None
+    batch_use_case: Optional[LikeTweetsFromFile] = None
+    if tweet_id_file:
+        batch_use_case = LikeTweetsFromFile(
+            twitter_api_client=api_client,
+            tweet_liking_service=tweet_liking_service,
+            engagement_criteria=lambda tweet: True,
+            tweet_id_reader=TweetIdFileReader(tweet_id_file),
+        )
     else:
-        print("Failed to like the tweet.")
+        use_case = LikeATweet(
+            twitter_api_client=api_client,
+            tweet_liking_service=tweet_liking_service,
+            # For future use in case we want to filter out tweets.
+            engagement_criteria=lambda tweet: True,
+            tweet_id=tweet_id,
+        )
+
+    profiler: Optional[Profiler] = None
+    if args.profile:
+        profiler = Profiler(args.profile_sample_interval)
+        set_profiler(profiler)
+        profiler.start()
+
+    try:
+        if batch_use_case:
+            batch_use_case.execute()
+        elif use_case and use_case.execute():
+            print(f"Tweet was liked successfully!")
+        else:
+            print("Failed to like the tweet.")
+    finally:
+        if profiler:
+            profiler.stop()
+            set_profiler(None)
+            print(profiler.report())
+            for path in profiler.write(args.profile_output):
+                print(f"Profiling results written to {path}")
+        # Closed last, as it raises if the log writer failed.
+        if engagement_log:
+            engagement_log.close()
 
 
 if __name__ == "__main__":
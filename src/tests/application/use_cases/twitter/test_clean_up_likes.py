@@ -0,0 +1,130 @@
+"""
+Testing the entire application flow for a use case of cleaning up
+likes.
+"""
+
+import pytest
+import pytest_mock as ptm
+from pathlib import Path
+from src.application.use_cases.twitter.clean_up_likes import CleanUpLikes
+from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.api_clients.twitter import ApiClient
+from src.infrastructure.storage import CheckpointStore
+
+
+def liked_tweet_data(tweet_id: str, created_at: str) -> dict:
+    return {
+        "id": tweet_id,
+        "author_id": "456",
+        "content": "Hello world",
+        "created_at": created_at,
+        "like_count": 10 * int(tweet_id),
+    }
+
+
+# Two pages of liked tweets, one old and one recent tweet each.
+liked_tweets_pages = [
+    (
+        [
+            liked_tweet_data("1", "2019-06-19T02:39:57.000Z"),
+            liked_tweet_data("2", "2999-01-01T00:00:00.000Z"),
+        ],
+        "page-2",
+    ),
+    (
+        [
+            liked_tweet_data("3", "2019-06-20T02:39:57.000Z"),
+            liked_tweet_data("4", "2999-01-01T00:00:00.000Z"),
+        ],
+        None,
+    ),
+]
+
+
+@pytest.fixture
+def mock_api_client(mocker) -> ptm.MockType:
+    mock_client = mocker.Mock(spec=ApiClient)
+    mock_client.unlike_tweet.return_value = True  # Simulating a
+    # successful unlike.
+
+    def get_liked_tweets(pagination_token=None):
+        start: int = 1 if pagination_token == "page-2" else 0
+        yield from liked_tweets_pages[start:]
+
+    mock_client.get_liked_tweets.side_effect = get_liked_tweets
+    return mock_client
+
+
+def test_clean_up_likes_use_case(
+    mock_api_client: ptm.MockType,
+    tmp_path: Path,
+) -> None:
+    """
+    Testing that only tweets meeting the cleanup criteria are unliked
+    and that a session stopped midway resumes from its checkpoint.
+    """
+    checkpoint_store = CheckpointStore(str(tmp_path / "cleanup.json"))
+    use_case = CleanUpLikes(
+        twitter_api_client=mock_api_client,
+        tweet_liking_service=TweetLikingService(mock_api_client),
+        cleanup_criteria=lambda tweet: not tweet.is_recent(),
+        checkpoint_store=checkpoint_store,
+        max_unlikes=1,
+    )
+
+    assert use_case.execute() == 1
+    assert checkpoint_store.load() == {"pagination_token": "page-2", "unliked": 1}
+
+    assert use_case.execute() == 1
+    mock_api_client.get_liked_tweets.assert_called_with("page-2")
+    unliked_ids = [
+        call.args[0].tweet_id for call in mock_api_client.unlike_tweet.call_args_list
+    ]
+    assert unliked_ids == ["1", "3"]
+    # Going through all the likes starts the next cleanup over.
+    assert checkpoint_store.load() == {}
+
+
+def test_clean_up_likes_stops_at_max_unlikes_mid_page(
+    mock_api_client: ptm.MockType,
+    tmp_path: Path,
+) -> None:
+    """
+    Testing that no more unlikes than `max_unlikes` are sent, even
+    within a page, and that the cut page is scanned again next
+    session.
+    """
+    mock_api_client.get_liked_tweets.side_effect = lambda pagination_token=None: iter(
+        [
+            (
+                [
+                    liked_tweet_data("1", "2019-06-19T02:39:57.000Z"),
+                    liked_tweet_data("2", "2019-06-19T02:39:57.000Z"),
+                    liked_tweet_data("3", "2019-06-19T02:39:57.000Z"),
+                ],
+                "page-2",
+            )
+        ]
+    )
+    checkpoint_store = CheckpointStore(str(tmp_path / "cleanup.json"))
+    checkpoint_store.save({"pagination_token": "page-1", "unliked": 0})
+    evaluated_ids: list = []
+
+    def cleanup_criteria(tweet) -> bool:
+        evaluated_ids.append(tweet.tweet_id)
+        # Like counts come from the tweets' public metrics.
+        return tweet.like_count < 30
+
+    result: int = CleanUpLikes(
+        twitter_api_client=mock_api_client,
+        tweet_liking_service=TweetLikingService(mock_api_client),
+        cleanup_criteria=cleanup_criteria,
+        checkpoint_store=checkpoint_store,
+        max_unlikes=1,
+    ).execute()
+
+    assert result == 1
+    assert mock_api_client.unlike_tweet.call_count == 1
+    # The criteria are evaluated once per tweet.
+    assert evaluated_ids == ["1", "2", "3"]
+    assert checkpoint_store.load() == {"pagination_token": "page-1", "unliked": 1}
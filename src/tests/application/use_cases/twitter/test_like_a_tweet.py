@@ -31,8 +31,9 @@ def mock_api_client(mocker) -> ptm.MockType:
         "id": tweet.tweet_id,
         "content": tweet.content,
         "author_id": tweet.author_id,
+        # API v2 timestamps, e.g. "2025-01-01T00:00:00.000Z".
         "created_at": tweet.created_at.strftime(
-            "%a %b %d %H:%M:%S %z %Y",
+            "%Y-%m-%dT%H:%M:%S.%f%z",
         ),
         "like_count": tweet.like_count,
     }
@@ -90,3 +91,30 @@ def test_like_a_tweet_use_case(
     # mock_api_client.like_tweet.assert_called_once_with(tweet)
 
     assert result is True
+
+
+def test_like_a_tweet_criteria_see_fetched_like_count(
+    mock_api_client: ptm.MockType,
+) -> None:
+    """
+    Testing that the engagement criteria work with the like count
+    fetched along with the tweet, without any extra lookup.
+    """
+    mock_api_client.get_tweet_by_id.return_value["like_count"] = 42
+    like_counts_seen: list[int] = []
+
+    def engagement_criteria(tweet: Tweet) -> bool:
+        like_counts_seen.append(tweet.like_count)
+        return True
+
+    result: bool = LikeATweet(
+        twitter_api_client=mock_api_client,
+        tweet_liking_service=TweetLikingService(mock_api_client),
+        engagement_criteria=engagement_criteria,
+        tweet_id=tweet.tweet_id,
+    ).execute()
+
+    assert result is True
+    assert like_counts_seen == [42]
+    mock_api_client.get_tweet_by_id.assert_called_once_with(tweet.tweet_id)
+    mock_api_client.get_tweets_public_metrics.assert_not_called()
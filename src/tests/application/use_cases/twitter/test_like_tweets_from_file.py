@@ -0,0 +1,69 @@
+"""
+Testing the entire application flow for a use case of liking the
+tweets of an ID file.
+"""
+
+import pytest
+import pytest_mock as ptm
+from pathlib import Path
+from src.application.use_cases.twitter.like_tweets_from_file import (
+    LikeTweetsFromFile,
+)
+from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.api_clients.twitter import ApiClient
+from src.infrastructure.storage import TweetIdFileReader
+
+
+@pytest.fixture
+def mock_api_client(mocker) -> ptm.MockType:
+    mock_client = mocker.Mock(spec=ApiClient)
+    mock_client.like_tweet.return_value = True  # Simulating a
+    # successful like.
+    # Every tweet but "404" is found, with a like count equal to its
+    # id. The lookup of tweet "500" fails.
+    mock_client.get_tweets_by_ids.side_effect = lambda tweet_ids: (
+        None
+        if "500" in tweet_ids
+        else [
+            {
+                "id": tweet_id,
+                "author_id": "456",
+                "content": "Hello world",
+                "created_at": "2025-01-01T00:00:00.000Z",
+                "like_count": int(tweet_id),
+            }
+            for tweet_id in tweet_ids
+            if tweet_id != "404"
+        ]
+    )
+    return mock_client
+
+
+def test_like_tweets_from_file_use_case(
+    mock_api_client: ptm.MockType,
+    tmp_path: Path,
+) -> None:
+    """
+    Testing that the tweets of the file are looked up in batches and
+    liked if they meet the criteria, and that a failed lookup leaves
+    its batch for the next run.
+    """
+    id_file: Path = tmp_path / "ids.txt"
+    id_file.write_text("1\n20\n404\n3\n500\n6\n")
+
+    result: int = LikeTweetsFromFile(
+        twitter_api_client=mock_api_client,
+        tweet_liking_service=TweetLikingService(mock_api_client),
+        engagement_criteria=lambda tweet: tweet.like_count < 10,
+        tweet_id_reader=TweetIdFileReader(str(id_file), batch_size=2),
+    ).execute()
+
+    assert result == 2
+    liked_ids = [
+        call.args[0].tweet_id for call in mock_api_client.like_tweet.call_args_list
+    ]
+    assert liked_ids == ["1", "3"]
+
+    # The next run starts over from the batch whose lookup failed.
+    next_run = TweetIdFileReader(str(id_file), batch_size=2).read_batches()
+    assert next(next_run) == ["500", "6"]
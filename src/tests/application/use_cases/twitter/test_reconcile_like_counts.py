@@ -0,0 +1,109 @@
+"""
+Testing the application flow for a use case of reconciling like
+counts.
+"""
+
+import time
+import pytest
+import pytest_mock as ptm
+from datetime import datetime, timezone
+from src.application.use_cases.twitter.reconcile_like_counts import (
+    ReconcileLikeCounts,
+)
+from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.api_clients.twitter import ApiClient
+from src.domain.entities.twitter import Tweet
+
+
+@pytest.fixture
+def mock_api_client(mocker) -> ptm.MockType:
+    mock_client = mocker.Mock(spec=ApiClient)
+    mock_client.like_tweet.return_value = True  # Simulating a
+    # successful like.
+    # Every tweet but "404" is found, with a like count of 100 + id.
+    mock_client.get_tweets_public_metrics.side_effect = lambda tweet_ids: {
+        tweet_id: {"like_count": 100 + int(tweet_id)}
+        for tweet_id in tweet_ids
+        if tweet_id != "404"
+    }
+    return mock_client
+
+
+def test_reconcile_like_counts_use_case(mock_api_client: ptm.MockType) -> None:
+    """
+    Testing that liked tweets get their counts refreshed in batched
+    lookups and merged back into the entities and the store.
+    """
+    persisted_like_counts: dict[str, int] = {}
+    reconciler = ReconcileLikeCounts(
+        mock_api_client,
+        persist_like_counts=persisted_like_counts.update,
+        batch_size=2,
+    )
+    tweet_liking_service = TweetLikingService(
+        mock_api_client,
+        on_like_count_change=reconciler.mark_stale,
+    )
+
+    tweets: list[Tweet] = [
+        Tweet(
+            tweet_id=tweet_id,
+            content="Hello world",
+            author_id="456",
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+        for tweet_id in ["1", "2", "3", "404"]
+    ]
+    for tweet in tweets:
+        tweet_liking_service.like_tweet(tweet, lambda tweet: True)
+
+    assert reconciler.execute() == 3
+
+    assert mock_api_client.get_tweets_public_metrics.call_count == 2
+    assert [tweet.like_count for tweet in tweets] == [101, 102, 103, 1]
+    assert persisted_like_counts == {"1": 101, "2": 102, "3": 103}
+    # Nothing is left queued.
+    assert reconciler.execute() == 0
+
+
+def test_reconcile_like_counts_keeps_queue_on_error(
+    mock_api_client: ptm.MockType,
+) -> None:
+    """
+    Testing that tweets not processed when a run fails stay queued,
+    and that a failed scheduled run doesn't end the schedule.
+    """
+    failing_store_calls: list[dict[str, int]] = []
+
+    def failing_store(like_counts: dict[str, int]) -> None:
+        failing_store_calls.append(like_counts)
+        raise OSError("The store is down.")
+
+    reconciler = ReconcileLikeCounts(
+        mock_api_client,
+        persist_like_counts=failing_store,
+        batch_size=2,
+    )
+    for tweet_id in ["1", "2", "3"]:
+        reconciler.mark_stale(
+            Tweet(
+                tweet_id=tweet_id,
+                content="Hello world",
+                author_id="456",
+                created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+
+    with pytest.raises(OSError):
+        reconciler.execute()
+    assert sorted(reconciler._stale_tweets) == ["1", "2", "3"]
+
+    # The scheduler survives the failing store and keeps retrying.
+    reconciler.start(interval_in_sec=0.01)
+    while len(failing_store_calls) < 3:
+        time.sleep(0.01)
+    reconciler.persist_like_counts = None
+    reconciler.stop()
+
+    assert reconciler._scheduler is None
+    assert reconciler.execute() == 0
@@ -0,0 +1,214 @@
+"""
+Testing infrastructure/api_clients/http/record_replay by replaying
+recorded Twitter traffic through a real ApiClient, offline.
+"""
+
+import json
+import base64
+import time
+import pytest
+import requests
+from pathlib import Path
+from datetime import datetime, timezone
+from src.domain.entities.twitter import Tweet
+from src.infrastructure.api_clients.twitter import ApiClient
+from src.infrastructure.api_clients.http import RecordingAdapter, ReplayAdapter
+
+
+# The cassette was recorded an hour before the tests run.
+RECORDED_AT: float = time.time() - 60 * 60
+
+
+class SimulatedTime:
+    """
+    A clock that only moves when slept on, recording the waits.
+    """
+
+    def __init__(self) -> None:
+        self.now: float = time.time()
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def recorded_interaction(
+    method: str,
+    url: str,
+    status: int,
+    body: dict,
+    headers: dict,
+) -> dict:
+    return {
+        "recorded_at": RECORDED_AT,
+        "request": {"method": method, "url": url, "body": None},
+        "response": {
+            "status": status,
+            "reason": "",
+            "headers": {"content-type": "application/json", **headers},
+            "body": base64.b64encode(json.dumps(body).encode()).decode(),
+            "elapsed": 0.2,
+        },
+    }
+
+
+@pytest.fixture
+def cassette_path(tmp_path: Path) -> str:
+    """
+    A cassette of liking two tweets, the first of which hits the
+    request quota on its first attempt and a server error on its
+    second.
+    """
+    # The quota reset 15 minutes after the recording.
+    reset_time: str = str(int(RECORDED_AT) + 15 * 60)
+    interactions: list[dict] = [
+        recorded_interaction(
+            "GET",
+            "https://api.twitter.com/2/users/me",
+            200,
+            {"data": {"id": "789", "name": "Name", "username": "name"}},
+            {},
+        ),
+        recorded_interaction(
+            "POST",
+            "https://api.twitter.com/2/users/789/likes",
+            429,
+            {"title": "Too Many Requests"},
+            {"x-rate-limit-remaining": "0", "x-rate-limit-reset": reset_time},
+        ),
+        recorded_interaction(
+            "POST",
+            "https://api.twitter.com/2/users/789/likes",
+            503,
+            {"title": "Service Unavailable"},
+            {},
+        ),
+        recorded_interaction(
+            "POST",
+            "https://api.twitter.com/2/users/789/likes",
+            200,
+            {"data": {"liked": True}},
+            {"x-rate-limit-remaining": "49", "x-rate-limit-reset": reset_time},
+        ),
+        recorded_interaction(
+            "POST",
+            "https://api.twitter.com/2/users/789/likes",
+            200,
+            {"data": {"liked": True}},
+            {"x-rate-limit-remaining": "48", "x-rate-limit-reset": reset_time},
+        ),
+    ]
+    path: Path = tmp_path / "like_tweet.json"
+    path.write_text(json.dumps({"interactions": interactions}))
+    return str(path)
+
+
+def test_replay_like_tweet(cassette_path: str) -> None:
+    """
+    Testing the quota and retry paths of liking a tweet against
+    recorded responses, on a simulated clock.
+    """
+    simulated_time = SimulatedTime()
+    api_client = ApiClient(
+        "key",
+        "secret",
+        "789-token",
+        "token-secret",
+        clock=simulated_time.time,
+        sleep=simulated_time.sleep,
+    )
+    replay_adapter = ReplayAdapter(cassette_path, clock=simulated_time.time)
+    api_client.use_http_adapter(replay_adapter)
+
+    tweet = Tweet(
+        tweet_id="123",
+        content="Hello world",
+        author_id="456",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    endpoint: str = "https://api.twitter.com/2/users/789/likes"
+
+    replay_start: float = time.perf_counter()
+    assert api_client.like_tweet(tweet) is True
+    # The reset time is as far away as when it was recorded, and the
+    # waits for it and the backoff happen on the simulated clock.
+    assert simulated_time.sleeps == [pytest.approx(15 * 60, abs=1), 2]
+    assert time.perf_counter() - replay_start < 5
+    # The quota follows the latest response, not the rate limited one.
+    assert api_client.request_quotas[endpoint][0] == 49
+
+    assert api_client.like_tweet(tweet) is True
+    assert api_client.request_quotas[endpoint][0] == 48
+    assert replay_adapter.remaining() == 0
+
+
+def test_record_then_replay(cassette_path: str, tmp_path: Path) -> None:
+    """
+    Testing that a recorded cassette replays the same responses.
+    """
+    recording_path: str = str(tmp_path / "recorded.json")
+    session = requests.Session()
+    # Recording from a replay instead of the network.
+    session.mount(
+        "https://",
+        RecordingAdapter(
+            recording_path,
+            ReplayAdapter(cassette_path, original_timing=True),
+        ),
+    )
+    recorded_response = session.get("https://api.twitter.com/2/users/me")
+    session.close()
+
+    session = requests.Session()
+    session.mount("https://", ReplayAdapter(recording_path, original_timing=True))
+    replayed_response = session.get("https://api.twitter.com/2/users/me")
+
+    assert replayed_response.status_code == recorded_response.status_code
+    assert replayed_response.json() == recorded_response.json()
+    # The replay takes as long as the original request did.
+    assert replayed_response.elapsed.total_seconds() >= 0.2
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("https://api.twitter.com/2/users/me")
+
+
+def test_replay_request_latency(cassette_path: str) -> None:
+    """
+    Testing that the latency of a like is the one of its last http
+    request, not the time spent retrying.
+    """
+    simulated_time = SimulatedTime()
+    api_client = ApiClient(
+        "key",
+        "secret",
+        "789-token",
+        "token-secret",
+        clock=simulated_time.time,
+        sleep=simulated_time.sleep,
+    )
+    api_client.use_http_adapter(
+        ReplayAdapter(
+            cassette_path,
+            original_timing=True,
+            clock=simulated_time.time,
+        )
+    )
+    tweet = Tweet(
+        tweet_id="123",
+        content="Hello world",
+        author_id="456",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+    like_start: float = time.perf_counter()
+    assert api_client.like_tweet(tweet) is True
+    like_duration: float = time.perf_counter() - like_start
+
+    latency = api_client.get_last_request_latency()
+    assert latency is not None
+    # Each recorded request took 0.2 seconds and the like sent four
+    # (get_me, the rate limited like, the failed one and its retry).
+    assert 0.2 <= latency < like_duration - 0.3
@@ -0,0 +1,83 @@
+"""
+Testing infrastructure/profiling/profiler/Profiler through the stages
+of the tweet liking service.
+"""
+
+import time
+import pytest
+import pytest_mock as ptm
+from datetime import datetime
+from pathlib import Path
+from src.domain.services.twitter.tweet_liking_service import TweetLikingService
+from src.infrastructure.api_clients.twitter import ApiClient
+from src.domain.entities.twitter import Tweet
+from src.infrastructure.profiling import Profiler, set_profiler, profile_stage
+
+
+tweet = Tweet(
+    tweet_id="123",
+    content="Hello world",
+    author_id="456",
+    created_at=datetime(2025, 1, 1),
+    like_count=0,
+)
+
+
+@pytest.fixture
+def mock_api_client(mocker) -> ptm.MockType:
+    mock_client = mocker.Mock(spec=ApiClient)
+    mock_client.like_tweet.return_value = True  # Simulating a
+    # successful like.
+    return mock_client
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler(sample_interval_in_sec=0.001)
+    set_profiler(profiler)
+    profiler.start()
+    yield profiler
+    profiler.stop()
+    set_profiler(None)
+
+
+def test_profiler_times_stages(
+    mock_api_client: ptm.MockType,
+    profiler: Profiler,
+    tmp_path: Path,
+) -> None:
+    """
+    Testing that the stages of liking a tweet are timed and written
+    out along with the sampled stacks.
+    """
+    tweet_liking_service = TweetLikingService(mock_api_client)
+    tweet_liking_service.like_tweet(tweet, lambda tweet: True)
+    tweet_liking_service.like_tweet(tweet, lambda tweet: False)
+    with profile_stage("wait"):
+        time.sleep(0.05)
+    profiler.stop()
+
+    assert profiler.stage_timings["criteria"][0] == 2
+    assert profiler.stage_timings["like"][0] == 1
+    assert profiler.stage_timings["wait"][1] >= 0.05 * 1e9
+    assert "wait" in profiler.report()
+
+    stages_path, stacks_path = profiler.write(str(tmp_path))
+    assert Path(stages_path).read_text().startswith("stage")
+    collapsed_stacks: list[str] = Path(stacks_path).read_text().splitlines()
+    assert any(
+        "test_profiler_times_stages" in stack for stack in collapsed_stacks
+    )
+    assert all(int(stack.rsplit(" ", 1)[1]) > 0 for stack in collapsed_stacks)
+
+
+def test_profile_stage_is_noop_when_off() -> None:
+    """
+    Testing that stages report nowhere when profiling is off.
+    """
+    with profile_stage("fetch"):
+        pass
+    with profile_stage("fetch"):
+        pass
+
+    assert profile_stage("fetch") is profile_stage("like")
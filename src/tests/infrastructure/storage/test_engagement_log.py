@@ -0,0 +1,133 @@
+"""
+Testing infrastructure/storage/engagement_log/EngagementLog and
+EngagementLogReader.
+"""
+
+import time
+import pytest
+from datetime import datetime, timezone
+from pathlib import Path
+from src.domain.entities.twitter import Tweet
+from src.infrastructure.storage import EngagementLog, EngagementLogReader
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_engagement_log_round_trip(tmp_path: Path, file_format: str) -> None:
+    """
+    Testing that recorded engagements are written in row groups and
+    read back through the reader.
+    """
+    engagement_log = EngagementLog(
+        str(tmp_path),
+        account="789",
+        file_format=file_format,
+        row_group_size=2,
+    )
+    for tweet_id in range(5):
+        tweet = Tweet(
+            tweet_id=tweet_id,
+            content="Hello world",
+            author_id="456",
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+        engagement_log.record(
+            tweet,
+            criteria_result=tweet_id % 2 == 0,
+            status="liked" if tweet_id % 2 == 0 else "skipped",
+            latency_in_sec=0.25 if tweet_id % 2 == 0 else None,
+        )
+    engagement_log.close()
+
+    table = EngagementLogReader(str(tmp_path)).read(
+        columns=["tweet_id", "status", "latency_ms", "account"],
+    )
+
+    assert table.column("tweet_id").to_pylist() == ["0", "1", "2", "3", "4"]
+    assert table.column("status").to_pylist().count("liked") == 3
+    assert table.column("latency_ms").to_pylist()[:2] == [250.0, None]
+    assert set(table.column("account").to_pylist()) == {"789"}
+
+
+def test_engagement_log_reader_empty_directory(tmp_path: Path) -> None:
+    """
+    Testing that reading a log nothing was written to gives an empty
+    table.
+    """
+    table = EngagementLogReader(str(tmp_path / "missing")).read()
+
+    assert table.num_rows == 0
+    assert "tweet_id" in table.column_names
+
+
+def record_engagements(engagement_log: EngagementLog, count: int) -> None:
+    for tweet_id in range(count):
+        engagement_log.record(
+            Tweet(
+                tweet_id=tweet_id,
+                content="Hello world",
+                author_id="456",
+                created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            ),
+            criteria_result=True,
+            status="liked",
+        )
+
+
+def test_engagement_log_reader_skips_unfinished_files(tmp_path: Path) -> None:
+    """
+    Testing that a log still being written, next to a closed one,
+    doesn't break reading the directory, and that files roll over
+    into completed ones every `row_groups_per_file` row groups.
+    """
+    closed_log = EngagementLog(str(tmp_path), account="789", row_group_size=2)
+    record_engagements(closed_log, 3)
+    closed_log.close()
+
+    live_log = EngagementLog(
+        str(tmp_path),
+        account="789",
+        row_group_size=1,
+        row_groups_per_file=2,
+    )
+    record_engagements(live_log, 3)
+    # Waiting for the first file of the live log to be completed and
+    # the next row group to be flushed to the file in progress.
+    deadline: float = time.monotonic() + 5
+    while time.monotonic() < deadline and not (
+        live_log.paths and list(tmp_path.glob("*.inprogress"))
+    ):
+        time.sleep(0.01)
+    assert list(tmp_path.glob("*.inprogress"))
+    # A damaged file is skipped as well.
+    (tmp_path / "engagements-broken.parquet").write_bytes(b"not parquet")
+
+    assert EngagementLogReader(str(tmp_path)).read().num_rows == 5
+
+    live_log.close()
+    assert len(live_log.paths) == 2
+    assert EngagementLogReader(str(tmp_path)).read().num_rows == 6
+
+
+def test_engagement_log_reports_writer_failure(tmp_path: Path) -> None:
+    """
+    Testing that a failing writer doesn't make recording hang or grow
+    memory, and that closing the log reports the failure.
+    """
+    log_dir: Path = tmp_path / "log"
+    engagement_log = EngagementLog(
+        str(log_dir),
+        account="789",
+        row_group_size=1,
+        max_queued_records=10,
+    )
+    # The writer can't create its file once the directory is gone.
+    log_dir.rmdir()
+
+    record_engagements(engagement_log, 1000)
+
+    assert engagement_log._records.qsize() <= 10
+    with pytest.raises(RuntimeError):
+        engagement_log.close()
+    assert engagement_log.paths == []
@@ -0,0 +1,81 @@
+"""
+Testing infrastructure/storage/tweet_id_file_reader/TweetIdFileReader.
+"""
+
+from pathlib import Path
+from src.infrastructure.storage import CheckpointStore, TweetIdFileReader
+
+
+def test_read_batches_dedupes_ids(tmp_path: Path) -> None:
+    """
+    Testing that IDs come out in batches with duplicates dropped.
+    """
+    id_file: Path = tmp_path / "ids.txt"
+    id_file.write_text("1\n2\n1\n\n3\n4\n5")
+
+    reader = TweetIdFileReader(str(id_file), batch_size=2)
+    batches: list[list] = list(reader.read_batches())
+
+    assert batches == [["1", "2"], ["3", "4"], ["5"]]
+    assert reader.offset == id_file.stat().st_size
+
+
+def test_read_batches_resumes_from_checkpoint(tmp_path: Path) -> None:
+    """
+    Testing that a reader stopped midway resumes right after the last
+    batch that was fully processed.
+    """
+    id_file: Path = tmp_path / "ids.txt"
+    id_file.write_text("".join(f"{tweet_id}\n" for tweet_id in range(10)))
+    checkpoint_store = CheckpointStore(str(tmp_path / "ids.offset"))
+
+    first_run = TweetIdFileReader(
+        str(id_file),
+        batch_size=3,
+        checkpoint_store=checkpoint_store,
+    ).read_batches()
+    assert next(first_run) == ["0", "1", "2"]
+    assert next(first_run) == ["3", "4", "5"]
+    # Crashing while the second batch is being processed.
+    first_run.close()
+
+    second_run = TweetIdFileReader(
+        str(id_file),
+        batch_size=3,
+        checkpoint_store=checkpoint_store,
+    )
+    assert list(second_run.read_batches()) == [["3", "4", "5"], ["6", "7", "8"], ["9"]]
+    # A finished file yields nothing on the next run.
+    assert list(second_run.read_batches()) == []
+
+
+def test_read_batches_skips_malformed_lines(tmp_path: Path) -> None:
+    """
+    Testing that malformed lines are skipped instead of aborting the
+    run.
+    """
+    id_file: Path = tmp_path / "ids.txt"
+    id_file.write_bytes(b"1\n\xff\xfe\nnot-an-id\n2\n")
+
+    reader = TweetIdFileReader(str(id_file), batch_size=10)
+
+    assert list(reader.read_batches()) == [["1", "2"]]
+
+
+def test_read_batches_restarts_on_changed_file(tmp_path: Path) -> None:
+    """
+    Testing that a checkpoint taken on another file is not applied to
+    the file that replaced it.
+    """
+    id_file: Path = tmp_path / "ids.txt"
+    id_file.write_text("1\n2\n3\n")
+    first_run = TweetIdFileReader(str(id_file), batch_size=2).read_batches()
+    next(first_run)
+    next(first_run)
+
+    replacement: Path = tmp_path / "replacement.txt"
+    replacement.write_text("4\n5\n6\n7\n")
+    replacement.replace(id_file)
+
+    reader = TweetIdFileReader(str(id_file), batch_size=10)
+    assert list(reader.read_batches()) == [["4", "5", "6", "7"]]
@@ -76,3 +76,28 @@ def test_api_client_like_tweet(
 
     mock_tweepy_client.like.assert_called_once_with(tweet.tweet_id)
     assert result is True
+
+
+def test_api_client_reserves_request_quota(
+    mocker: ptm.MockFixture,
+    api_client: ApiClient,
+) -> None:
+    """
+    Testing that requests in flight count against the remaining
+    quota, so concurrent callers wait instead of running into the
+    rate limit.
+    """
+    endpoint: str = "https://api.twitter.com/2/users/789/likes"
+    reset_time: int = int(datetime.now(timezone.utc).timestamp()) + 900
+    api_client.request_quotas[endpoint] = (1, reset_time)
+    mock_wait = mocker.patch.object(api_client, "_wait_for_request_quota_reset")
+
+    with api_client._request_quota(endpoint):
+        # The last remaining request is taken by this one.
+        assert api_client._is_above_request_quota(endpoint) == (True, reset_time)
+    assert api_client._is_above_request_quota(endpoint) == (False, reset_time)
+    mock_wait.assert_not_called()
+
+    # Once the reset time passed, the quota is full again.
+    api_client.request_quotas[endpoint] = (0, reset_time - 1000)
+    assert api_client._is_above_request_quota(endpoint)[0] is False